@@ -1,13 +1,15 @@
 import sys
-import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from enum import Enum
 from PyQt6.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout, 
-                             QMenu, QSystemTrayIcon, QInputDialog, QGraphicsDropShadowEffect,
+                             QMenu, QSystemTrayIcon, QInputDialog,
                              QStyle, QDialog, QFormLayout, QSpinBox, QPushButton, QColorDialog,
                              QSlider, QHBoxLayout, QTabWidget, QComboBox, QCheckBox)
-from PyQt6.QtCore import Qt, QTimer, QTime, QPoint, QSettings, QDateTime, QElapsedTimer, QRectF, QSize
+from PyQt6.QtCore import Qt, QTimer, QPoint, QPointF, QSettings, QRectF, QSize, QEvent
 from PyQt6.QtGui import (QFont, QMouseEvent, QAction, QPainter, QPainterPath, 
-                         QPen, QBrush, QFontMetrics, QColor)
+                         QPen, QBrush, QFontMetrics, QColor, QPixmap, QImage)
 
 # --- Define the different application modes ---
 class AppMode(Enum):
@@ -16,26 +18,184 @@ class AppMode(Enum):
     TIMER = 2
     POMODORO = 3
 
+# --- Duration input parsing ("1h 30m", "45s", "90") ---
+UNIT_MS = {'h': 3_600_000, 'm': 60_000, 's': 1000}
+
+def parse_duration(s):
+    """Parses "1h 30m", "45s" or "90" (seconds) into ms; malformed input gives 0."""
+    total_ms = 0
+    n = None    # Number being read, None between tokens
+    gap = False # Whitespace seen since the last digit
+    for c in s.lower():
+        if '0' <= c <= '9':
+            if n is not None and gap: # "1 2": the previous bare number ends here
+                total_ms += n * 1000
+                n = None
+            n = (n or 0) * 10 + (ord(c) - 48)
+            gap = False
+        elif c in UNIT_MS:
+            if n is None: return 0 # Unit without a number
+            total_ms += n * UNIT_MS[c]
+            n = None
+        elif c.isspace():
+            gap = True
+        else:
+            return 0 # "1:30", "5 mins", ... are rejected instead of half-parsed
+    if n is not None:
+        total_ms += n * 1000
+    return total_ms
+
+# --- Monotonic ms clock for durations (immune to wall-clock changes) ---
+def monotonic_ms():
+    return time.monotonic_ns() // 1_000_000
+
+# --- Plain integer formatters (no QTime allocation per tick) ---
+ZZ = tuple(f"{i:02d}" for i in range(100)) # "00".."99", indexed instead of formatted
+
+def format_hms(ms):
+    s, ms = divmod(ms, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    if 0 <= h < 100:
+        return ZZ[h] + ":" + ZZ[m] + ":" + ZZ[s]
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+@lru_cache(maxsize=4)
+def hms_prefix(total_s):
+    # "HH:MM:SS." only changes once a second, the stopwatch reuses it for ~30 ticks
+    m, s = divmod(total_s, 60)
+    h, m = divmod(m, 60)
+    if 0 <= h < 100:
+        return ZZ[h] + ":" + ZZ[m] + ":" + ZZ[s] + "."
+    return f"{h:02d}:{m:02d}:{s:02d}."
+
+def format_hms_cs(ms):
+    # Stopwatch variant with centiseconds (hours simply widen past 99)
+    s, cs = divmod(ms // 10, 100)
+    return hms_prefix(s) + ZZ[cs]
+
+# --- Fixed-width digits so the label doesn't resize on every tick ---
+MONOSPACE_FALLBACK = ["Consolas", "JetBrains Mono", "DejaVu Sans Mono"]
+
+def has_tabular_digits(font):
+    metrics = QFontMetrics(font)
+    return len({metrics.horizontalAdvance(d) for d in "0123456789"}) == 1
+
+def make_tabular_font(font):
+    """Coerces a font to tabular figures, falling back to a monospace face."""
+    if has_tabular_digits(font):
+        return font
+    # OpenType 'tnum' feature is only exposed from Qt 6.7 onwards
+    if hasattr(QFont, "Tag"):
+        try:
+            font.setFeature(QFont.Tag("tnum"), 1)
+        except (TypeError, ValueError):
+            pass
+        if has_tabular_digits(font):
+            return font
+    font.setFamilies(MONOSPACE_FALLBACK)
+    font.setStyleHint(QFont.StyleHint.Monospace)
+    return font
+
+# --- Control Panel theme (module level so the string is built once) ---
+CONTROL_PANEL_QSS = """
+    QDialog { background-color: #1e1e2e; color: #cdd6f4; font-family: 'Segoe UI', sans-serif; }
+    QLabel { color: #cdd6f4; font-size: 14px; font-weight: 500; }
+    QTabWidget::pane { border: 1px solid #313244; border-radius: 8px; background: #181825; }
+    QTabBar::tab { background: #1e1e2e; color: #a6adc8; padding: 10px 20px; border-top-left-radius: 6px; border-top-right-radius: 6px; }
+    QTabBar::tab:selected { background: #313244; color: #89b4fa; font-weight: bold; }
+    QPushButton { background-color: #89b4fa; color: #11111b; border: none; border-radius: 6px; padding: 10px 16px; font-weight: bold; }
+    QPushButton:hover { background-color: #b4befe; }
+    QPushButton:disabled { background-color: #45475a; color: #a6adc8; }
+    QComboBox, QSpinBox { background-color: #313244; color: #cdd6f4; border: 1px solid #45475a; border-radius: 4px; padding: 6px; }
+    QSlider::groove:horizontal { border-radius: 4px; height: 8px; background: #313244; }
+    QSlider::handle:horizontal { background: #89b4fa; width: 16px; height: 16px; margin: -4px 0; border-radius: 8px; }
+    QCheckBox { font-size: 14px; font-weight: bold; color: #f38ba8; }
+    QCheckBox::indicator { width: 18px; height: 18px; border-radius: 4px; background-color: #313244; border: 1px solid #45475a;}
+    QCheckBox::indicator:checked { background-color: #f38ba8; }
+"""
+
 # --- Custom Outlined Label for Ghost Mode ---
 class OutlinedLabel(QLabel):
     def sizeHint(self):
-        font = self.font()
-        metrics = QFontMetrics(font)
-        text = self.text() if self.text() else "00:00:00"
+        text = self._text if self._text else "00:00:00"
         
         # Dynamically scale breathing room based on Control Panel slider
         pad = self.parent().config.get("rect_padding", 20) if self.parent() else 20
-        width = metrics.horizontalAdvance(text) + (pad * 2)
-        height = metrics.height() + (pad * 2)
+        width = self.text_advance(text) + (pad * 2)
+        height = self._height + (pad * 2)
         return QSize(int(width), int(height))
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Parent window handles transparency and paintEvent covers the whole label,
+        # so skip Qt's background fill pass (but we are still not opaque)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground, True)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
         self.is_hollow = False
         self.hollow_color = QColor("#FFFFFF")
+        self.flash_color = None # Overrides the text color only, the ring keeps hollow_color
         self.outline_thickness = 2
         self.progress = 0.0 # 0.0 to 1.0
         self.show_ring = False
+        self._text = "" # Python-side copy of text(), saves a QString round trip per paint
+        self.shadow_depth = 3
+        self.pressed = False # Dragging compresses the baked-in shadow
+
+        # Progress ring geometry cache (rebuilt only when the size changes)
+        self._ring_path = None
+        self._ring_path_len = 0.0
+        self._ring_path_key = None
+        self._ring_pen = None # Progress pen, dash pattern fixed per path length
+
+        # Font metrics and glyph outline caches (refreshed in setFont)
+        self._text_adv_cache = {}
+        self._glyph_cache = OrderedDict() # LRU of outline paths, built at the origin
+
+        # Text + drop shadow rendered once per text/font/color/size change, then blitted.
+        # One entry per pressed state so press/release just swap pixmaps.
+        self._text_pixmaps = {} # pressed -> (key, pixmap)
+        self._cache_metrics(self.font())
+
+    def setText(self, text):
+        self._text = text
+        super().setText(text)
+
+    def setFont(self, font):
+        super().setFont(font)
+        self._cache_metrics(font)
+        self.updateGeometry()
+
+    def _cache_metrics(self, font):
+        self._metrics = QFontMetrics(font)
+        self._ascent = self._metrics.ascent()
+        self._descent = self._metrics.descent()
+        self._height = self._metrics.height()
+        self._text_adv_cache.clear()
+        self._glyph_cache.clear()
+        self._text_pixmaps.clear()
+
+    def text_advance(self, text):
+        adv = self._text_adv_cache.get(text)
+        if adv is None:
+            # Stopwatch text is different every tick, keep the cache bounded
+            if len(self._text_adv_cache) >= 256:
+                self._text_adv_cache.clear()
+            adv = self._text_adv_cache[text] = self._metrics.horizontalAdvance(text)
+        return adv
+
+    def glyph_path(self, text, font):
+        key = (text, font.family(), font.pointSize(), font.weight())
+        path = self._glyph_cache.get(key)
+        if path is None:
+            path = QPainterPath()
+            path.addText(0, 0, font, text)
+            self._glyph_cache[key] = path
+            if len(self._glyph_cache) > 16:
+                self._glyph_cache.popitem(last=False)
+        else:
+            self._glyph_cache.move_to_end(key)
+        return path
 
     def set_hollow_style(self, enabled, color_hex="#FFFFFF", thickness=2):
         self.is_hollow = enabled
@@ -43,82 +203,191 @@ class OutlinedLabel(QLabel):
         self.outline_thickness = thickness
         self.update()
 
+    def set_flash_color(self, color_hex=None):
+        # Color-only change of the text (None = back to normal), ring and track stay put
+        self.flash_color = QColor(color_hex) if color_hex else None
+        self.flash_update()
+
+    def flash_update(self):
+        self.update(self._text_bounds())
+
+    def set_shadow_depth(self, depth):
+        self.shadow_depth = depth
+        self.update()
+
+    def set_pressed(self, pressed):
+        self.pressed = pressed
+        self.update()
+
     def set_progress(self, progress, show=True):
-        self.progress = max(0.0, min(1.0, progress))
+        progress = max(0.0, min(1.0, progress))
+        # Less than a pixel of travel along the ring: nothing visible to repaint
+        if (show == self.show_ring and progress > 0 and self._ring_path_len
+                and abs(progress - self.progress) < 1.0 / self._ring_path_len):
+            return
+        self.progress = progress
         self.show_ring = show
         self.update()
 
     def paintEvent(self, event):
-        # 1. Draw Text (Solid or Hollow)
-        if not self.is_hollow:
-            super().paintEvent(event)
-        else:
-            painter = QPainter(self)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            text = self.text()
-            font = self.font()
-            painter.setFont(font)
-            metrics = QFontMetrics(font)
-            rect = self.rect()
-            x = (rect.width() - metrics.horizontalAdvance(text)) / 2.0
-            y = (rect.height() + metrics.ascent() - metrics.descent()) / 2.0
-            path = QPainterPath()
-            path.addText(x, y, font, text)
-            pen = QPen(self.hollow_color)
-            pen.setWidth(self.outline_thickness)
-            painter.setPen(pen)
-            painter.setBrush(QBrush(Qt.GlobalColor.transparent))
-            painter.drawPath(path)
+        # One painter for both passes instead of a begin/end pair each
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        try:
+            # 1. Draw Text (Solid or Hollow) with its pre-baked shadow
+            painter.drawPixmap(0, 0, self._text_pixmap())
+
+            # 2. Draw the Tracing Progress Rectangle (text-only repaints are clipped, path and pen are cached)
+            if self.show_ring:
+                rect = self.rect()
+                radius = 12.0
+
+                key = (rect.width(), rect.height(), radius)
+                if key != self._ring_path_key:
+                    self._rebuild_ring_path(rect, radius)
+                    self._ring_path_key = key
+                path = self._ring_path
+
+                # Hard drop shadow under the ring (the text shadow lives in the pixmap)
+                offset = 0 if self.pressed else self.shadow_depth
+                if offset:
+                    painter.save()
+                    painter.translate(offset, offset)
+                    shadow_pen = QPen(QColor(0, 0, 0, 90))
+                    shadow_pen.setWidthF(4.0)
+                    painter.setPen(shadow_pen)
+                    painter.drawPath(path)
+                    painter.restore()
+
+                # Draw Faint Background Track
+                bg_color = QColor(self.hollow_color)
+                bg_color.setAlpha(40)
+                pen = QPen(bg_color)
+                pen.setWidthF(4.0)
+                pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+                painter.setPen(pen)
+                painter.drawPath(path)
+
+                # Draw Solid Active Progress (Traces the perimeter!)
+                if self.progress > 0:
+                    fg_color = QColor(self.hollow_color)
+                    fg_color.setAlpha(255)
+                    self._ring_pen.setColor(fg_color)
+
+                    # MAGIC TRICK: One full-length dash followed by a huge gap; shifting the
+                    # dash offset back leaves exactly `progress` of the path visible
+                    pen_width = self._ring_pen.widthF()
+                    self._ring_pen.setDashOffset((1.0 - self.progress) * self._ring_path_len / pen_width)
+                    painter.setPen(self._ring_pen)
+                    painter.drawPath(path)
+        finally:
             painter.end()
 
-        # 2. Draw the Tracing Progress Rectangle
-        if self.show_ring:
-            painter = QPainter(self)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            rect = self.rect()
-            
-            # The box draws slightly inside the boundaries so shadows don't clip
-            draw_rect = QRectF(4, 4, rect.width() - 8, rect.height() - 8)
-            radius = 12.0
-            
-            # Create a path starting from Top-Center going Clockwise
-            path = QPainterPath()
-            path.moveTo(draw_rect.center().x(), draw_rect.top()) # Start Top Center
-            path.lineTo(draw_rect.right() - radius, draw_rect.top())
-            path.arcTo(draw_rect.right() - 2*radius, draw_rect.top(), 2*radius, 2*radius, 90, -90)
-            path.lineTo(draw_rect.right(), draw_rect.bottom() - radius)
-            path.arcTo(draw_rect.right() - 2*radius, draw_rect.bottom() - 2*radius, 2*radius, 2*radius, 0, -90)
-            path.lineTo(draw_rect.left() + radius, draw_rect.bottom())
-            path.arcTo(draw_rect.left(), draw_rect.bottom() - 2*radius, 2*radius, 2*radius, 270, -90)
-            path.lineTo(draw_rect.left(), draw_rect.top() + radius)
-            path.arcTo(draw_rect.left(), draw_rect.top(), 2*radius, 2*radius, 180, -90)
-            path.lineTo(draw_rect.center().x(), draw_rect.top()) # Back to Top Center
-
-            # Draw Faint Background Track
-            bg_color = QColor(self.hollow_color)
-            bg_color.setAlpha(40)
-            pen = QPen(bg_color)
-            pen.setWidthF(4.0)
-            pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+    def _text_pixmap(self):
+        text = self._text
+        font = self.font()
+        dpr = self.devicePixelRatioF()
+        # Pressed = shadow pulled in (offset 0, blur 5), released = offset by depth, blur 15
+        offset, blur = (0, 5) if self.pressed else (self.shadow_depth, 15)
+        # Everything that affects the pixels is in the key, so changing any of it invalidates the entry
+        text_color = self.flash_color or self.hollow_color
+        key = (text, font.key(), self.is_hollow, text_color.rgba(), self.outline_thickness,
+               offset, blur, self.width(), self.height(), dpr)
+        cached = self._text_pixmaps.get(self.pressed)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        pixmap = QPixmap(self.size() * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        path = self.glyph_path(text, font)
+        painter.translate(self._text_origin(text))
+
+        # Soft shadow: one cheap fill into a downscaled image, smooth upscaling does the blur
+        shadow_rect = path.boundingRect().adjusted(-blur, -blur, blur, blur)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawImage(shadow_rect.translated(offset, offset), self._shadow_image(path, shadow_rect, blur, dpr))
+
+        if self.is_hollow:
+            pen = QPen(text_color)
+            pen.setWidth(self.outline_thickness)
             painter.setPen(pen)
+            painter.setBrush(QBrush(Qt.GlobalColor.transparent))
             painter.drawPath(path)
-
-            # Draw Solid Active Progress (Traces the perimeter!)
-            if self.progress > 0:
-                fg_color = QColor(self.hollow_color)
-                fg_color.setAlpha(255)
-                pen.setColor(fg_color)
-                
-                # MAGIC TRICK: We use dashed lines to draw a percentage of the path!
-                path_length = path.length()
-                dash_len = (path_length * self.progress) / 4.0
-                gap_len = (path_length + 50) / 4.0 # Massive gap so it doesn't repeat
-                
-                pen.setDashPattern([dash_len, gap_len])
-                painter.setPen(pen)
-                painter.drawPath(path)
-                
-            painter.end()
+        else:
+            painter.setFont(font)
+            painter.setPen(text_color)
+            painter.drawText(0, 0, text)
+        painter.end()
+
+        self._text_pixmaps[self.pressed] = (key, pixmap)
+        return pixmap
+
+    def _text_origin(self, text):
+        # Baseline start that centers the text in the label
+        return QPointF((self.width() - self.text_advance(text)) / 2.0,
+                       (self.height() + self._ascent - self._descent) / 2.0)
+
+    def _text_bounds(self):
+        # Pixels the text itself covers (outline pen and AA included), the shadow's color never changes
+        grow = self.outline_thickness / 2.0 + 1
+        rect = self.glyph_path(self._text, self.font()).boundingRect().translated(self._text_origin(self._text))
+        return rect.adjusted(-grow, -grow, grow, grow).toAlignedRect()
+
+    def _shadow_image(self, path, shadow_rect, blur, dpr):
+        scale = min(1.0, 3.0 / blur) * dpr # blur 15 -> 1/5 size, the upscale spreads each pixel ~5 px
+        image = QImage(max(1, int(shadow_rect.width() * scale)), max(1, int(shadow_rect.height() * scale)),
+                       QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.scale(scale, scale)
+        painter.translate(-shadow_rect.left(), -shadow_rect.top())
+        shadow_color = QColor(0, 0, 0, 200)
+        if self.is_hollow:
+            # Ghost mode only shadows the outline, like the old drop-shadow effect did
+            pen = QPen(shadow_color)
+            pen.setWidth(self.outline_thickness)
+            painter.strokePath(path, pen)
+        else:
+            painter.fillPath(path, shadow_color)
+        painter.end()
+        return image
+
+    def _rebuild_ring_path(self, rect, radius):
+        # The box draws slightly inside the boundaries so shadows don't clip
+        draw_rect = QRectF(4, 4, rect.width() - 8, rect.height() - 8)
+
+        # Create a path starting from Top-Center going Clockwise
+        path = QPainterPath()
+        path.moveTo(draw_rect.center().x(), draw_rect.top()) # Start Top Center
+        path.lineTo(draw_rect.right() - radius, draw_rect.top())
+        path.arcTo(draw_rect.right() - 2*radius, draw_rect.top(), 2*radius, 2*radius, 90, -90)
+        path.lineTo(draw_rect.right(), draw_rect.bottom() - radius)
+        path.arcTo(draw_rect.right() - 2*radius, draw_rect.bottom() - 2*radius, 2*radius, 2*radius, 0, -90)
+        path.lineTo(draw_rect.left() + radius, draw_rect.bottom())
+        path.arcTo(draw_rect.left(), draw_rect.bottom() - 2*radius, 2*radius, 2*radius, 270, -90)
+        path.lineTo(draw_rect.left(), draw_rect.top() + radius)
+        path.arcTo(draw_rect.left(), draw_rect.top(), 2*radius, 2*radius, 180, -90)
+        path.lineTo(draw_rect.center().x(), draw_rect.top()) # Back to Top Center
+
+        self._ring_path = path
+        self._ring_path_len = path.length()
+
+        # Dash lengths are in pen-width units
+        self._ring_pen = QPen()
+        self._ring_pen.setWidthF(4.0)
+        self._ring_pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+        dash_len = self._ring_path_len / self._ring_pen.widthF()
+        self._ring_pen.setDashPattern([dash_len, dash_len * 2]) # Massive gap so it doesn't repeat
+
+    def resizeEvent(self, event):
+        self._ring_path_key = None
+        self._text_pixmaps.clear()
+        super().resizeEvent(event)
     
 
 class SettingsDialog(QDialog):
@@ -163,23 +432,15 @@ class ControlPanel(QDialog):
         self.app = app_instance
         self.setWindowTitle("Control Panel")
         self.setFixedSize(400, 480) # Increased height for new settings
+
+        # Slider drags emit far more often than we can repaint; apply at most once per frame
+        self._live_coalesce = QTimer(self)
+        self._live_coalesce.setSingleShot(True)
+        self._live_coalesce.setInterval(16)
+        self._live_coalesce.timeout.connect(self._apply_live_settings)
         
-        self.setStyleSheet("""
-            QDialog { background-color: #1e1e2e; color: #cdd6f4; font-family: 'Segoe UI', sans-serif; }
-            QLabel { color: #cdd6f4; font-size: 14px; font-weight: 500; }
-            QTabWidget::pane { border: 1px solid #313244; border-radius: 8px; background: #181825; }
-            QTabBar::tab { background: #1e1e2e; color: #a6adc8; padding: 10px 20px; border-top-left-radius: 6px; border-top-right-radius: 6px; }
-            QTabBar::tab:selected { background: #313244; color: #89b4fa; font-weight: bold; }
-            QPushButton { background-color: #89b4fa; color: #11111b; border: none; border-radius: 6px; padding: 10px 16px; font-weight: bold; }
-            QPushButton:hover { background-color: #b4befe; }
-            QPushButton:disabled { background-color: #45475a; color: #a6adc8; }
-            QComboBox, QSpinBox { background-color: #313244; color: #cdd6f4; border: 1px solid #45475a; border-radius: 4px; padding: 6px; }
-            QSlider::groove:horizontal { border-radius: 4px; height: 8px; background: #313244; }
-            QSlider::handle:horizontal { background: #89b4fa; width: 16px; height: 16px; margin: -4px 0; border-radius: 8px; }
-            QCheckBox { font-size: 14px; font-weight: bold; color: #f38ba8; }
-            QCheckBox::indicator { width: 18px; height: 18px; border-radius: 4px; background-color: #313244; border: 1px solid #45475a;}
-            QCheckBox::indicator:checked { background-color: #f38ba8; }
-        """)
+        self.setObjectName("ControlPanel")
+        self.setStyleSheet(CONTROL_PANEL_QSS)
         
         layout = QVBoxLayout(self)
         tabs = QTabWidget()
@@ -206,7 +467,7 @@ class ControlPanel(QDialog):
         self.start_btn = QPushButton("Start / Pause")
         self.start_btn.clicked.connect(self.toggle_action)
         self.reset_btn = QPushButton("Reset")
-        self.reset_btn.clicked.connect(self.app.action_stopwatch_reset if self.app.current_mode == AppMode.STOPWATCH else self.app.action_timer_reset)
+        self.reset_btn.clicked.connect(self.reset_action) # Dispatches on the mode at click time
         
         c_layout.addWidget(self.set_duration_btn)
         c_layout.addWidget(self.start_btn)
@@ -271,6 +532,39 @@ class ControlPanel(QDialog):
 
         self.update_ui_for_mode(self.app.current_mode)
 
+    def refresh_from_app(self):
+        # The panel is reused between opens, so pull in anything changed elsewhere (e.g. tray)
+        widgets = [self.ghost_check, self.mode_combo, self.font_spin, self.thick_slider,
+                   self.shadow_slider, self.pad_slider, self.pomo_work_spin, self.pomo_break_spin]
+        for w in widgets: w.blockSignals(True)
+        self.ghost_check.setChecked(self.app.ghost_mode_enabled)
+        self.mode_combo.setCurrentIndex(self.app.current_mode.value)
+        self.font_spin.setValue(self.app.config["font_size"])
+        self.thick_slider.setValue(self.app.config["outline_thickness"])
+        self.shadow_slider.setValue(self.app.config["shadow_depth"])
+        self.pad_slider.setValue(self.app.config.get("rect_padding", 20))
+        self.pomo_work_spin.setValue(self.app.config["pomo_work_min"])
+        self.pomo_break_spin.setValue(self.app.config["pomo_break_min"])
+        for w in widgets: w.blockSignals(False)
+        self.temp_color = self.app.config["text_color"]
+        self.update_ui_for_mode(self.app.current_mode)
+
+    def sync_mode(self, mode):
+        # Only the mode widgets; the Settings tab may hold edits that aren't saved yet
+        self.mode_combo.blockSignals(True)
+        self.mode_combo.setCurrentIndex(mode.value)
+        self.mode_combo.blockSignals(False)
+        self.update_ui_for_mode(mode)
+
+    def showEvent(self, event):
+        self.refresh_from_app()
+        super().showEvent(event)
+
+    def closeEvent(self, event):
+        # Keep the instance around for the next open instead of destroying it
+        event.ignore()
+        self.hide()
+
     def toggle_ghost(self, checked):
         self.app.toggle_ghost_mode(checked)
         # Update tray icon to stay in sync
@@ -305,12 +599,23 @@ class ControlPanel(QDialog):
                 self.app.timer_total_duration_ms = self.app.timer_paused_duration_ms
             self.app.action_timer_start_pause()
 
+    def reset_action(self):
+        if self.app.current_mode == AppMode.STOPWATCH:
+            self.app.action_stopwatch_reset()
+        elif self.app.current_mode in [AppMode.TIMER, AppMode.POMODORO]:
+            self.app.action_timer_reset()
+
     def live_update_settings(self):
+        # Don't restart a pending update, or a continuous drag would never apply
+        if not self._live_coalesce.isActive():
+            self._live_coalesce.start()
+
+    def _apply_live_settings(self):
         self.app.config["outline_thickness"] = self.thick_slider.value()
         self.app.config["shadow_depth"] = self.shadow_slider.value()
         self.app.config["rect_padding"] = self.pad_slider.value() # Live update padding
         
-        self.app.shadow.setOffset(self.app.config["shadow_depth"], self.app.config["shadow_depth"])
+        self.app.time_label.set_shadow_depth(self.app.config["shadow_depth"])
         self.app.time_label.set_hollow_style(self.app.ghost_mode_enabled, self.app.config["text_color"], self.app.config["outline_thickness"])
         
         # Force the label to recalculate its sizeHint based on the new padding
@@ -334,25 +639,35 @@ class TimeUtilityApp(QWidget):
     def __init__(self):
         super().__init__()
         self.old_pos = None
+        self._last_saved_pos = None
+        self.cp = None # Control Panel, created lazily in open_control_panel
+        self._last_tick = None # Integer key of what update_display last put on screen
+        self._last_text = "" # Last string handed to time_label.setText
+        self._last_text_width = -1 # Label width last sized for; -1 forces the first adjustSize()
+        self._font = None
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self.save_position_only)
+        self._font_key = None # (family, size, weight) of self._font
+        self._active_style = None # Stylesheet currently applied to time_label
         self.current_mode = AppMode.CLOCK
         self.ghost_mode_enabled = False
 
         # Stopwatch state
-        self.stopwatch_timer = QElapsedTimer()
+        self.stopwatch_start = 0 # monotonic_ms() when the current run started
         self.stopwatch_running = False
         self.stopwatch_paused_ms = 0
 
         # Timer state
-        self.timer_end_time = None
+        self.timer_deadline_ms = 0 # Deadline on the monotonic_ms() clock
         self.timer_running = False
         self.timer_paused_duration_ms = 0
-        self.flash_timer = QTimer(self)
-        self.flash_timer.timeout.connect(self.on_flash_tick)
+        self._flash_start = None # monotonic_ms() when the flash began, None when not flashing
         self.flash_count = 0
 
         # Configuration
         self.config = {
-            "font_family": "Segoe UI",
+            "font_family": "Segoe UI", # Coerced to tabular digits, see make_tabular_font()
             "font_size": 48,
             "font_weight": QFont.Weight.Bold,
             "text_color": "#FFFFFF",
@@ -365,6 +680,8 @@ class TimeUtilityApp(QWidget):
             "pomo_break_min": 5,
             "rect_padding": 20,
         }
+        # One QSettings for the app's lifetime instead of reopening the store per load/save
+        self._settings = QSettings("MyTimeUtility", "TimeApp")
         self.load_settings()
 
         self.pomo_is_work = True # Tracks if currently in work or break cycle
@@ -373,7 +690,7 @@ class TimeUtilityApp(QWidget):
         self.init_tray_icon()
 
     def load_settings(self):
-        settings = QSettings("MyTimeUtility", "TimeApp")
+        settings = self._settings
         pos = self.pos()
         self.config["initial_pos_x"] = settings.value("pos_x", pos.x(), type=int)
         self.config["initial_pos_y"] = settings.value("pos_y", pos.y(), type=int)
@@ -392,9 +709,10 @@ class TimeUtilityApp(QWidget):
         self.config["rect_padding"] = settings.value("rect_padding", 20, type=int)
 
     def save_settings(self):
-        settings = QSettings("MyTimeUtility", "TimeApp")
+        settings = self._settings
         settings.setValue("pos_x", self.pos().x())
         settings.setValue("pos_y", self.pos().y())
+        self._last_saved_pos = self.pos()
         settings.setValue("last_mode", self.current_mode.value)
         settings.setValue("ghost_mode", self.ghost_mode_enabled)
         
@@ -406,6 +724,16 @@ class TimeUtilityApp(QWidget):
         settings.setValue("pomo_work_min", self.config["pomo_work_min"])
         settings.setValue("pomo_break_min", self.config["pomo_break_min"])
         settings.setValue("rect_padding", self.config["rect_padding"])
+        settings.sync() # One flush to the backing store for the whole batch
+
+    def save_position_only(self):
+        # Drag release: only the position can have changed, and maybe not even that
+        if self.pos() == self._last_saved_pos:
+            return
+        settings = self._settings
+        settings.setValue("pos_x", self.pos().x())
+        settings.setValue("pos_y", self.pos().y())
+        self._last_saved_pos = self.pos()
 
     def initUI(self):
         self.setWindowFlags(
@@ -421,12 +749,8 @@ class TimeUtilityApp(QWidget):
         self.update_font_and_style()
         self.time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        # Apply Drop Shadow for Depth/Visibility
-        self.shadow = QGraphicsDropShadowEffect(self)
-        self.shadow.setBlurRadius(15)
-        self.shadow.setColor(QColor(0, 0, 0, 200))
-        self.shadow.setOffset(self.config["shadow_depth"], self.config["shadow_depth"])
-        self.time_label.setGraphicsEffect(self.shadow)
+        # Drop Shadow for Depth/Visibility (baked into the label's text pixmap)
+        self.time_label.set_shadow_depth(self.config["shadow_depth"])
 
         layout = QVBoxLayout()
         layout.addWidget(self.time_label)
@@ -440,42 +764,99 @@ class TimeUtilityApp(QWidget):
         # Apply Ghost Mode state on boot
         self.toggle_ghost_mode(self.ghost_mode_enabled)
 
-        # Main UI update loop
+        # Main UI update loop (cadence depends on the mode, see _retune_timer)
         self.main_timer = QTimer(self)
-        self.main_timer.timeout.connect(self.update_display)
-        self.main_timer.start(33)
+        self.main_timer.setTimerType(Qt.TimerType.PreciseTimer) # Coarse timers may fire ~5% early
+        self.main_timer.timeout.connect(self.on_main_tick)
+        self.update_display()
+        self._retune_timer()
 
         self.setWindowTitle("Time Utility")
         self.show()
 
-    def update_font_and_style(self, color=None):
-        if color is None:
-            color = self.config["text_color"]
-            
-        font = QFont(self.config["font_family"], self.config["font_size"], self.config["font_weight"])
-        self.time_label.setFont(font)
+    def update_font_and_style(self):
+        # Only build a new QFont (and re-probe tabular digits) when it actually changed
+        font_key = (self.config["font_family"], self.config["font_size"], self.config["font_weight"])
+        if font_key != self._font_key:
+            self._font = make_tabular_font(QFont(*font_key))
+            self.time_label.setFont(self._font)
+            self._font_key = font_key
+            self._last_text_width = -1 # Font changed, force the next adjustSize()
         
         # Apply standard CSS, but also pass color to outline logic for Ghost Mode
-        self.time_label.setStyleSheet(f"color: {color}; background:transparent;")
-        self.time_label.set_hollow_style(self.ghost_mode_enabled, color)
+        # Re-applying an identical sheet still re-parses it and repolishes the label
+        style = f"color: {self.config['text_color']}; background:transparent;"
+        if style != self._active_style:
+            self.time_label.setStyleSheet(style)
+            self._active_style = style
+        self.time_label.set_hollow_style(self.ghost_mode_enabled, self.config["text_color"], self.config["outline_thickness"])
+
+    def _display_hidden(self):
+        return not self.isVisible() or self.isMinimized()
+
+    def _retune_timer(self):
+        if self._display_hidden():
+            # Nothing to draw; only wake for a running deadline so the alarm still fires
+            if self.current_mode in [AppMode.TIMER, AppMode.POMODORO] and self.timer_running:
+                # QTimer takes a 32-bit int; long timers just sleep again from on_main_tick
+                self.main_timer.start(max(0, min(self.timer_deadline_ms - monotonic_ms(), 60_000)))
+            else:
+                self.main_timer.stop()
+            return
+        # Only tick as fast as the visible text can actually change
+        if self.current_mode == AppMode.CLOCK:
+            # Land on the next whole second; on_main_tick re-aligns after every tick
+            self.main_timer.start(1000 - (time.time_ns() // 1_000_000) % 1000)
+        elif self.current_mode == AppMode.STOPWATCH and self.stopwatch_running:
+            self.main_timer.start(33)
+        elif self.current_mode in [AppMode.TIMER, AppMode.POMODORO] and self.timer_running:
+            self.main_timer.start(100)
+        elif self._flash_start is not None:
+            self.main_timer.start(250) # Finished timer flashing, driven by on_main_tick
+        else:
+            self.main_timer.stop() # Paused: nothing on screen changes
+
+    def on_main_tick(self):
+        if self._flash_start is not None:
+            self.on_flash_tick()
+        self.update_display()
+        if self.current_mode == AppMode.CLOCK or self._display_hidden():
+            # A fixed 1000 ms interval drifts off the second boundary; re-arm to the next one.
+            # While hidden, a tick that fired just short of the deadline re-arms the same way
+            self._retune_timer()
 
     def update_display(self):
+        # Nobody can see it; showEvent brings the display up to date again.
+        # A running timer still has to notice its own expiry, so it only skips the label work
+        hidden = self._display_hidden()
+        if hidden and self.current_mode in [AppMode.CLOCK, AppMode.STOPWATCH]:
+            return
+
         display_text = ""
         progress_val = 0.0
         show_ring = False
 
+        # Cheap integer "what's on screen" key per mode; formatting and the label are
+        # only touched when it changes
         if self.current_mode == AppMode.CLOCK:
-            display_text = QTime.currentTime().toString("hh:mm:ss AP")
+            sec = int(time.time())
+            tick = (self.current_mode, sec)
+            if tick == self._last_tick: return # Same second, nothing to re-format
+            t = time.localtime(sec)
+            h12 = ((t.tm_hour - 1) % 12) + 1
+            ap = "AM" if t.tm_hour < 12 else "PM"
+            display_text = f"{h12:02d}:{t.tm_min:02d}:{t.tm_sec:02d} {ap}"
 
         elif self.current_mode == AppMode.STOPWATCH:
-            elapsed = self.stopwatch_timer.elapsed() + self.stopwatch_paused_ms if self.stopwatch_running else self.stopwatch_paused_ms
-            time = QTime(0, 0, 0, 0).addMSecs(elapsed)
-            display_text = time.toString("HH:mm:ss.zzz")[:-1]
+            elapsed = monotonic_ms() - self.stopwatch_start + self.stopwatch_paused_ms if self.stopwatch_running else self.stopwatch_paused_ms
+            tick = (self.current_mode, elapsed // 10) # Centiseconds, the finest digit shown
+            if tick == self._last_tick: return
+            display_text = format_hms_cs(elapsed)
 
         elif self.current_mode == AppMode.TIMER or self.current_mode == AppMode.POMODORO:
             show_ring = True
             if self.timer_running:
-                remaining_ms = QDateTime.currentDateTime().msecsTo(self.timer_end_time)
+                remaining_ms = self.timer_deadline_ms - monotonic_ms()
                 if remaining_ms <= 0:
                     remaining_ms = 0
                     self.timer_running = False
@@ -485,26 +866,40 @@ class TimeUtilityApp(QWidget):
                         self.pomo_is_work = not self.pomo_is_work
                         mins = self.config["pomo_work_min"] if self.pomo_is_work else self.config["pomo_break_min"]
                         self.timer_paused_duration_ms = mins * 60000
+                        # The timer stops below, so show the next interval ourselves
+                        QTimer.singleShot(0, self.update_display)
+                    self._retune_timer()
                 
                 # Calculate progress ring
                 total_ms = self.timer_paused_duration_ms if not self.timer_running else self.timer_total_duration_ms 
                 if total_ms > 0:
                     progress_val = remaining_ms / total_ms
-                
-                time = QTime(0, 0, 0, 0).addMSecs(max(0, remaining_ms))
-                display_text = time.toString("HH:mm:ss")
+                shown_ms = max(0, remaining_ms)
             else:
-                time = QTime(0, 0, 0, 0).addMSecs(self.timer_paused_duration_ms)
-                display_text = time.toString("HH:mm:ss")
+                shown_ms = self.timer_paused_duration_ms
                 progress_val = 1.0
 
+            if hidden: return
+            tick = (self.current_mode, self.pomo_is_work, self.timer_running, shown_ms // 1000)
+            if tick == self._last_tick: return
+            display_text = format_hms(shown_ms)
+
             if self.current_mode == AppMode.POMODORO:
                 prefix = "WORK: " if self.pomo_is_work else "BREAK: "
                 display_text = prefix + display_text
 
-        if self.time_label.text() != display_text:
+        self._last_tick = tick
+        # The tick key can change while the text doesn't (e.g. timer paused on a whole second)
+        if display_text != self._last_text:
+            self._last_text = display_text
             self.time_label.setText(display_text)
+        # No ring before or after: nothing for set_progress to repaint
+        if show_ring or self.time_label.show_ring:
             self.time_label.set_progress(progress_val, show_ring)
+        # Only re-layout the window when the rendered width actually moves
+        text_width = self.time_label.text_advance(display_text)
+        if text_width != self._last_text_width:
+            self._last_text_width = text_width
             self.adjustSize()
 
     # --- Mode Switching, Context Menu, Actions... ---
@@ -514,7 +909,10 @@ class TimeUtilityApp(QWidget):
         if mode != AppMode.STOPWATCH: self.action_stopwatch_reset()
         if mode != AppMode.TIMER: self.action_timer_reset()
         self.update_display()
+        self._retune_timer()
         self.save_settings()
+        if self.cp is not None and self.cp.isVisible():
+            self.cp.sync_mode(mode) # Mode may have come from the tray; keep unsaved edits intact
 
     def contextMenuEvent(self, event):
         if self.ghost_mode_enabled: return
@@ -522,50 +920,46 @@ class TimeUtilityApp(QWidget):
 
     def action_stopwatch_start_pause(self):
         if self.stopwatch_running:
-            self.stopwatch_paused_ms += self.stopwatch_timer.elapsed()
+            self.stopwatch_paused_ms += monotonic_ms() - self.stopwatch_start
             self.stopwatch_running = False
         else:
-            self.stopwatch_timer.start()
+            self.stopwatch_start = monotonic_ms()
             self.stopwatch_running = True
+        self.update_display() # Show the exact paused value before the timer stops
+        self._retune_timer()
 
     def action_stopwatch_reset(self):
         self.stopwatch_running = False
         self.stopwatch_paused_ms = 0
         self.update_display()
+        self._retune_timer()
 
     def action_timer_set(self):
         self.stop_flash_animation()
-        duration_str, ok = QInputDialog.getText(self, "Set Timer", "Enter duration (e.g., '1h 30m', '45s'):")
+        # The dialog runs a nested event loop; don't redraw behind it while the user types
+        self.main_timer.stop()
+        try:
+            duration_str, ok = QInputDialog.getText(self, "Set Timer", "Enter duration (e.g., '1h 30m', '45s'):")
+        finally:
+            self._retune_timer()
         if ok and duration_str:
-            duration_ms = self.parse_duration_string(duration_str)
+            duration_ms = parse_duration(duration_str)
             if duration_ms > 0:
                 self.timer_paused_duration_ms = duration_ms
                 self.timer_running = False
                 self.update_display()
-
-    def parse_duration_string(self, s: str) -> int:
-        total_ms = 0
-        s = s.lower()
-        try:
-            parts = re.findall(r'(\d+)\s*(h|m|s)?', s)
-            if not parts: return int(s) * 1000
-            for value, unit in parts:
-                value = int(value)
-                if unit == 'h': total_ms += value * 3600000
-                elif unit == 'm': total_ms += value * 60000
-                elif unit == 's' or unit is None: total_ms += value * 1000
-            return total_ms
-        except (ValueError, TypeError):
-            return 0
+                self._retune_timer()
 
     def action_timer_start_pause(self):
         if self.timer_running:
-            self.timer_paused_duration_ms = QDateTime.currentDateTime().msecsTo(self.timer_end_time)
+            self.timer_paused_duration_ms = self.timer_deadline_ms - monotonic_ms()
             self.timer_running = False
         elif self.timer_paused_duration_ms > 0:
-            self.timer_end_time = QDateTime.currentDateTime().addMSecs(self.timer_paused_duration_ms)
+            self.timer_deadline_ms = monotonic_ms() + self.timer_paused_duration_ms
             self.timer_running = True
             self.stop_flash_animation()
+        self.update_display()
+        self._retune_timer()
 
     def action_timer_reset(self):
         self.timer_running = False
@@ -581,25 +975,34 @@ class TimeUtilityApp(QWidget):
             self.timer_total_duration_ms = 0
             
         self.update_display()
+        self._retune_timer()
 
     def start_flash_animation(self):
-        QApplication.beep()
+        # MessageBeep can stall for tens of ms on some drivers; let the event loop run it
+        QTimer.singleShot(0, QApplication.beep)
         self.flash_count = 0
-        self.flash_timer.start(250)
+        self._flash_start = monotonic_ms()
+        self._retune_timer()
 
     def stop_flash_animation(self):
-        self.flash_timer.stop()
-        self.update_font_and_style()
+        self._flash_start = None
+        self.set_flash_state(False)
+        self._retune_timer()
 
     def on_flash_tick(self):
-        self.flash_count += 1
+        # Phase comes from the clock, so the shared timer's cadence doesn't matter
+        count = (monotonic_ms() - self._flash_start) // 250
+        if count == self.flash_count:
+            return
+        self.flash_count = count
         if self.flash_count > 10:
             self.stop_flash_animation()
             return
-        if self.flash_count % 2 == 1:
-            self.update_font_and_style(color=self.config["flash_color"])
-        else:
-            self.update_font_and_style()
+        self.set_flash_state(self.flash_count % 2 == 1)
+
+    def set_flash_state(self, flashing):
+        # Only the text rect is repainted; the stylesheet no longer drives the painted color
+        self.time_label.set_flash_color(self.config["flash_color"] if flashing else None)
 
     # --- System Tray ---
     def init_tray_icon(self):
@@ -657,8 +1060,7 @@ class TimeUtilityApp(QWidget):
         if event.button() == Qt.MouseButton.LeftButton:
             self.old_pos = event.globalPosition().toPoint()
             # Compress shadow to simulate "pressing down"
-            self.shadow.setOffset(0, 0)
-            self.shadow.setBlurRadius(5)
+            self.time_label.set_pressed(True)
 
     def mouseMoveEvent(self, event: QMouseEvent):
         if self.ghost_mode_enabled: return
@@ -673,12 +1075,33 @@ class TimeUtilityApp(QWidget):
 
         if event.button() == Qt.MouseButton.LeftButton:
             self.old_pos = None
-            self.save_settings()
+            # Debounced: a quick series of drags ends in a single write
+            self._save_timer.start(2000)
             # Expand shadow to simulate "popping up"
-            self.shadow.setOffset(3, 3)
-            self.shadow.setBlurRadius(15)
+            self.time_label.set_pressed(False)
+
+    def hideEvent(self, event):
+        # Don't wake the event loop while hidden, except at a running timer's deadline
+        if hasattr(self, 'main_timer'):
+            self._retune_timer()
+        super().hideEvent(event)
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        # Minimizing doesn't hide the window, so hideEvent/showEvent never see it
+        if event.type() == QEvent.Type.WindowStateChange and hasattr(self, 'main_timer'):
+            self._retune_timer()
+            if not self._display_hidden():
+                self.update_display()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if hasattr(self, 'main_timer'):
+            self.update_display()
+            self._retune_timer()
 
     def quit_application(self):
+        self._save_timer.stop() # save_settings below covers any pending position
         self.save_settings()
         self.tray_icon.hide()
         QApplication.instance().quit()
@@ -694,8 +1117,12 @@ class TimeUtilityApp(QWidget):
             self.adjustSize()
             self.save_settings()
     def open_control_panel(self):
-        self.cp = ControlPanel(self)
+        # Built once on first use, then just shown again
+        if self.cp is None:
+            self.cp = ControlPanel(self)
         self.cp.show()
+        self.cp.raise_()
+        self.cp.activateWindow()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)